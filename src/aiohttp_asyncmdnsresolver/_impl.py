@@ -3,9 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import random
 import socket
 import sys
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from functools import partial
 from ipaddress import IPv4Address, IPv6Address
+from operator import itemgetter
+from time import monotonic
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from aiohttp.resolver import AsyncResolver, ResolveResult
@@ -22,105 +30,456 @@ if TYPE_CHECKING:
 
 DEFAULT_TIMEOUT = 5.0
 
+# Default lifetime in seconds of resolved (positive) and failed (negative)
+# .local lookups in the per-resolver result cache, and its maximum number of
+# entries.
+_POSITIVE_CACHE_TTL = 30.0
+_NEGATIVE_CACHE_TTL = 2.0
+_RESULT_CACHE_SIZE = 256
+
 # Emulates ``typing.Self`` (Python 3.11+) so the context manager helpers keep
 # their precise subclass return type while still supporting Python 3.10.
 _ResolverT = TypeVar("_ResolverT", bound="_AsyncMDNSResolverBase")
+_T = TypeVar("_T")
 
 ResolverType = AddressResolver | AddressResolverIPv4 | AddressResolverIPv6
+_QueryKey = tuple[str, int, socket.AddressFamily]
 
-_FAMILY_TO_RESOLVER_CLASS: dict[
+# Resolver class and zeroconf IP version for each supported address family,
+# fused into one table so an mDNS lookup needs a single dict access.
+_FAMILY_TABLE: dict[
     socket.AddressFamily,
-    type[AddressResolver] | type[AddressResolverIPv4] | type[AddressResolverIPv6],
+    tuple[
+        type[AddressResolver] | type[AddressResolverIPv4] | type[AddressResolverIPv6],
+        IPVersion,
+    ],
 ] = {
-    socket.AF_INET: AddressResolverIPv4,
-    socket.AF_INET6: AddressResolverIPv6,
-    socket.AF_UNSPEC: AddressResolver,
-}
-_FAMILY_TO_IP_VERSION = {
-    socket.AF_INET: IPVersion.V4Only,
-    socket.AF_INET6: IPVersion.V6Only,
-    socket.AF_UNSPEC: IPVersion.All,
-}
-_IP_VERSION_TO_FAMILY = {
-    4: socket.AF_INET,
-    6: socket.AF_INET6,
+    socket.AF_INET: (AddressResolverIPv4, IPVersion.V4Only),
+    socket.AF_INET6: (AddressResolverIPv6, IPVersion.V6Only),
+    socket.AF_UNSPEC: (AddressResolver, IPVersion.All),
 }
+
+# Module-level bindings spare an attribute lookup on the asyncio module for
+# every call on the resolve paths.
+_current_task = asyncio.current_task
+_get_running_loop = asyncio.get_running_loop
+
 _NUMERIC_SOCKET_FLAGS = socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+_family_key = itemgetter("family")
+_LOCAL_SUFFIX = ".local"
+_LOCAL_SUFFIX_LEN = len(_LOCAL_SUFFIX)
+
+# AsyncZeroconf handed out to resolvers created with ``shared=True``, along
+# with the number of resolvers currently using it, per event loop. Zeroconf is
+# bound to the loop it was started on, so an instance is never shared across
+# loops; each entry is only touched from the thread running its loop.
+_SHARED_AIOZC: dict[asyncio.AbstractEventLoop, tuple[AsyncZeroconf, int]] = {}
+
+# Whether ``create_task()`` of a given event loop class accepts ``eager_start``
+# (Python 3.13.3+ for the stdlib loops); filled in lazily per loop class.
+_LOOP_ACCEPTS_EAGER_START: dict[type[asyncio.AbstractEventLoop], bool] = {}
 
 
 def _is_local_name(host: str) -> bool:
     """Return True if the host is in the .local mDNS domain.
 
     RFC 6762 requires the .local suffix to be matched case-insensitively.
+    Only the trailing label is lowercased so non-mDNS names, which are the
+    common case, do not pay for copying the whole host name.
     """
-    return host.lower().endswith((".local", ".local."))
+    if host[-1:] == ".":
+        host = host[:-1]
+    return host[-_LOCAL_SUFFIX_LEN:].lower() == _LOCAL_SUFFIX
 
 
-def _to_resolve_result(
+def _to_resolve_result_v4(
+    hostname: str, port: int, ipaddress: IPv4Address | IPv6Address
+) -> ResolveResult:
+    """Convert an address zeroconf returned for IPv4 to a ResolveResult."""
+    # str() is the compressed form, and zeroconf's address objects cache it.
+    # A dict literal builds the TypedDict without keyword argument handling.
+    return {
+        "hostname": hostname,
+        "host": str(ipaddress),
+        "port": port,
+        "family": socket.AF_INET,
+        "proto": 0,
+        "flags": _NUMERIC_SOCKET_FLAGS,
+    }
+
+
+def _to_resolve_result_v6(
     hostname: str, port: int, ipaddress: IPv4Address | IPv6Address
 ) -> ResolveResult:
-    """Convert an IP address to a ResolveResult."""
-    return ResolveResult(
-        hostname=hostname,
-        host=ipaddress.compressed,
-        port=port,
-        family=_IP_VERSION_TO_FAMILY[ipaddress.version],
-        proto=0,
-        flags=_NUMERIC_SOCKET_FLAGS,
+    """Convert an address zeroconf returned for IPv6 to a ResolveResult."""
+    return {
+        "hostname": hostname,
+        "host": str(ipaddress),
+        "port": port,
+        "family": socket.AF_INET6,
+        "proto": 0,
+        "flags": _NUMERIC_SOCKET_FLAGS,
+    }
+
+
+# Converter for each single-family IP version, so the family is picked once
+# per lookup instead of being checked for every address.
+_IP_VERSION_TO_CONVERTER: dict[
+    IPVersion, Callable[[str, int, IPv4Address | IPv6Address], ResolveResult]
+] = {
+    IPVersion.V4Only: _to_resolve_result_v4,
+    IPVersion.V6Only: _to_resolve_result_v6,
+}
+
+
+def _prune_shared_aiozc() -> None:
+    """Forget shared instances left behind on loops that have been closed.
+
+    Such instances belong to resolvers that were never closed; they can no
+    longer be used or closed, and holding them would keep their loops alive.
+    """
+    for loop in list(_SHARED_AIOZC):
+        if loop.is_closed():
+            _SHARED_AIOZC.pop(loop, None)
+
+
+def _acquire_shared_aiozc(loop: asyncio.AbstractEventLoop) -> AsyncZeroconf:
+    """Return the AsyncZeroconf shared on ``loop``, creating it on first use."""
+    if (entry := _SHARED_AIOZC.get(loop)) is None:
+        _prune_shared_aiozc()
+        aiozc, refs = AsyncZeroconf(), 0
+    else:
+        aiozc, refs = entry
+    _SHARED_AIOZC[loop] = (aiozc, refs + 1)
+    return aiozc
+
+
+async def _release_shared_aiozc(aiozc: AsyncZeroconf) -> None:
+    """Drop a reference to a shared AsyncZeroconf, closing it with the last."""
+    _prune_shared_aiozc()
+    for loop, (shared_aiozc, refs) in list(_SHARED_AIOZC.items()):
+        if shared_aiozc is aiozc:
+            break
+    else:
+        return
+    if (refs := refs - 1) > 0:
+        _SHARED_AIOZC[loop] = (aiozc, refs)
+        return
+    # Unpublish before awaiting so a resolver created while the close is in
+    # progress gets a fresh instance instead of one that is shutting down.
+    del _SHARED_AIOZC[loop]
+    await aiozc.async_close()
+
+
+def _accepts_eager_start(func: Callable[..., Any]) -> bool:
+    """Return True if ``func`` can be passed an ``eager_start`` argument."""
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):  # e.g. implemented in C
+        return False
+    return "eager_start" in parameters or any(
+        param.kind is param.VAR_KEYWORD for param in parameters.values()
     )
 
 
+def _loop_accepts_eager_start(loop: asyncio.AbstractEventLoop) -> bool:
+    """Return True if ``loop.create_task()`` forwards ``eager_start``."""
+    return _accepts_eager_start(loop.create_task)
+
+
+# The Python version is fixed for the life of the process, so pick the
+# version-specific helpers once at import time rather than on every resolve.
+if sys.version_info >= (3, 12):
+
+    def _create_eager_task(
+        loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, _T]
+    ) -> asyncio.Task[_T]:
+        """Create a task that starts eagerly.
+
+        The loop's own ``create_task()`` is preferred so a custom loop or task
+        factory (e.g. uvloop) is honoured; ``asyncio.Task`` is only constructed
+        directly when the loop, or the task factory set on it, cannot start a
+        task eagerly itself.
+        """
+        loop_cls = type(loop)
+        if (eager := _LOOP_ACCEPTS_EAGER_START.get(loop_cls)) is None:
+            eager = _LOOP_ACCEPTS_EAGER_START[loop_cls] = _loop_accepts_eager_start(
+                loop
+            )
+        # create_task() passes keyword arguments on to the task factory set
+        # on the loop, and one written for the older (loop, coro, context=None)
+        # signature rejects eager_start. The factory can be swapped at any
+        # time, so it is checked on every call instead of being cached; this
+        # only happens when a factory is set and a query is about to be sent.
+        if eager and (factory := loop.get_task_factory()) is not None:
+            eager = _accepts_eager_start(factory)
+        if eager:
+            return loop.create_task(coro, eager_start=True)  # type: ignore[call-arg,unused-ignore]
+        return asyncio.Task(coro, loop=loop, eager_start=True)
+
+else:
+
+    def _create_eager_task(
+        loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, _T]
+    ) -> asyncio.Task[_T]:
+        """Create a task; eager start is not available before Python 3.12."""
+        return loop.create_task(coro)
+
+
+if sys.version_info >= (3, 11):
+
+    def _current_task_cancelling() -> bool:
+        """Return True if the current task has a pending cancellation request."""
+        return bool((task := _current_task()) and task.cancelling())
+
+else:
+
+    def _current_task_cancelling() -> bool:
+        """Return False; ``Task.cancelling()`` is not available before 3.11."""
+        return False
+
+
+def _set_first_done(first: asyncio.Future[None], _task: object = None) -> None:
+    """Resolve ``first`` when the first of several tasks (or a timer) finishes."""
+    if not first.done():
+        first.set_result(None)
+
+
+def _normalize_local_name(host: str) -> str:
+    """Return a .local host name in lowercase with a trailing dot.
+
+    mDNS and DNS names are case-insensitive, so the normalized form is used
+    for the queries as well as the in-flight and result cache keys.
+    """
+    return (host if host[-1] == "." else f"{host}.").lower()
+
+
+def _shuffle_results(rng: random.Random, results: list[ResolveResult]) -> None:
+    """Shuffle results in place while keeping IPv4 ahead of IPv6 results."""
+    rng.shuffle(results)
+    # list.sort() is stable, so this only regroups the families.
+    results.sort(key=_family_key)
+
+
+def _collect_results(
+    task: asyncio.Task[list[ResolveResult]],
+    resolve_results: list[ResolveResult],
+    seen_results: set[str],
+    exceptions: list[BaseException],
+) -> None:
+    """Merge a finished task's results, or record its exception.
+
+    Results are de-duplicated on the IP address only: the two resolvers may
+    report different hostname strings for the same name, so including the
+    hostname could let the same endpoint through twice, and both were asked
+    for the same port. Keying on the address string also avoids building a
+    tuple per result and reuses the string's cached hash.
+    """
+    if not task.done():
+        return
+    if exc := task.exception():
+        exceptions.append(exc)
+        return
+    for result in task.result():
+        if (result_key := result["host"]) not in seen_results:
+            seen_results.add(result_key)
+            resolve_results.append(result)
+
+
 class _AsyncMDNSResolverBase(AsyncResolver):
     """Use the `aiodns`/`zeroconf` packages to make asynchronous DNS lookups."""
 
+    # AsyncResolver does not define __slots__, so instances keep a __dict__
+    # for its state; ours lives in slots to keep each resolver smaller.
+    __slots__ = (
+        "_rng",
+        "_mdns_timeout_ms",
+        "_aiozc_shared",
+        "_aiozc_owner",
+        "_aiozc",
+        "_closed",
+        "_inflight",
+        "_res_cache",
+        "_positive_ttl",
+        "_negative_ttl",
+    )
+
     def __init__(
         self,
         *args: Any,
         async_zeroconf: AsyncZeroconf | None = None,
         mdns_timeout: float | None = DEFAULT_TIMEOUT,
+        shared: bool = False,
+        shuffle: bool = False,
+        positive_ttl: float | None = _POSITIVE_CACHE_TTL,
+        negative_ttl: float | None = _NEGATIVE_CACHE_TTL,
         **kwargs: Any,
     ) -> None:
         """Initialize the resolver."""
         super().__init__(*args, **kwargs)
-        self._mdns_timeout = mdns_timeout
-        self._aiozc_owner = async_zeroconf is None
-        self._aiozc = async_zeroconf or AsyncZeroconf()
+        # A private generator avoids contending on the global random state.
+        self._rng = random.Random() if shuffle else None
+        # zeroconf expects milliseconds; a falsy value means cache-only lookups.
+        self._mdns_timeout_ms = mdns_timeout * 1000 if mdns_timeout else 0
+        self._aiozc_shared = shared and async_zeroconf is None
+        self._aiozc_owner = async_zeroconf is None and not shared
+        # Starting zeroconf binds multicast sockets, so an internal instance
+        # is only created (or the shared one acquired) by _get_aiozc() once
+        # a .local name is actually resolved.
+        self._aiozc: AsyncZeroconf | None = async_zeroconf
+        self._closed = False
+        # mDNS queries currently on the network, shared by concurrent callers
+        # resolving the same name.
+        self._inflight: dict[_QueryKey, asyncio.Task[list[ResolveResult]]] = {}
+        # Recent .local results as (expiry, result or error message), least
+        # recently used first. Expired entries are dropped lazily when looked
+        # up. Only the message of an error is kept so a cache hit raises a
+        # fresh exception rather than one holding an earlier caller's frames.
+        self._res_cache: OrderedDict[
+            _QueryKey, tuple[float, list[ResolveResult] | str]
+        ] = OrderedDict()
+        # A falsy lifetime disables caching of that kind of outcome.
+        self._positive_ttl = positive_ttl or 0.0
+        self._negative_ttl = negative_ttl or 0.0
+
+    def _get_aiozc(self) -> AsyncZeroconf:
+        """Return the AsyncZeroconf instance, creating it on first use."""
+        if self._closed:
+            raise RuntimeError("Resolver is closed")
+        if (aiozc := self._aiozc) is not None:
+            return aiozc
+        if self._aiozc_shared:
+            aiozc = _acquire_shared_aiozc(_get_running_loop())
+        else:
+            aiozc = AsyncZeroconf()
+        self._aiozc = aiozc
+        return aiozc
 
-    def _make_resolver(self, host: str, family: socket.AddressFamily) -> ResolverType:
-        """Create an mDNS resolver."""
-        resolver_class = _FAMILY_TO_RESOLVER_CLASS[family]
-        return resolver_class(host if host[-1] == "." else f"{host}.")
+    def _make_resolver(
+        self, host: str, family: socket.AddressFamily
+    ) -> tuple[ResolverType, IPVersion]:
+        """Create an mDNS resolver and return it with the IP version to query.
+
+        ``host`` must already be normalized by ``_normalize_local_name()``.
+        """
+        resolver_class, ip_version = _FAMILY_TABLE[family]
+        return resolver_class(host), ip_version
 
     def _addresses_from_info_or_raise(
-        self, info: ResolverType, port: int, family: socket.AddressFamily
+        self, info: ResolverType, port: int, ip_version: IPVersion
     ) -> list[ResolveResult]:
         """Get addresses from info or raise OSError."""
-        ip_version = _FAMILY_TO_IP_VERSION[family]
-        if addresses := info.ip_addresses_by_version(ip_version):
-            if TYPE_CHECKING:
-                assert info.server is not None
-            return [
-                _to_resolve_result(info.server, port, address) for address in addresses
+        # Read the attribute once rather than for every address.
+        server = info.server
+        if TYPE_CHECKING:
+            assert server is not None
+        if ip_version is IPVersion.All:
+            # Query each family separately so every address is converted with
+            # its family already known instead of checking its version.
+            results = [
+                _to_resolve_result_v4(server, port, address)
+                for address in info.ip_addresses_by_version(IPVersion.V4Only)
             ]
+            results.extend(
+                _to_resolve_result_v6(server, port, address)
+                for address in info.ip_addresses_by_version(IPVersion.V6Only)
+            )
+        else:
+            to_resolve_result = _IP_VERSION_TO_CONVERTER[ip_version]
+            results = [
+                to_resolve_result(server, port, address)
+                for address in info.ip_addresses_by_version(ip_version)
+            ]
+        if results:
+            return results
         raise OSError(None, "MDNS lookup failed")
 
     async def _resolve_mdns(
-        self, info: ResolverType, port: int, family: socket.AddressFamily
+        self, info: ResolverType, port: int, ip_version: IPVersion
     ) -> list[ResolveResult]:
         """Resolve a host name to an IP address using mDNS."""
-        if self._mdns_timeout:
-            await info.async_request(self._aiozc.zeroconf, self._mdns_timeout * 1000)
-        return self._addresses_from_info_or_raise(info, port, family)
+        if self._mdns_timeout_ms:
+            await info.async_request(self._get_aiozc().zeroconf, self._mdns_timeout_ms)
+        return self._addresses_from_info_or_raise(info, port, ip_version)
+
+    def _cache_lookup(self, key: _QueryKey) -> list[ResolveResult] | None:
+        """Return a copy of a cached result, re-raise a cached error or None."""
+        if (entry := self._res_cache.get(key)) is None:
+            return None
+        expiry, result = entry
+        if expiry <= monotonic():
+            del self._res_cache[key]
+            return None
+        self._res_cache.move_to_end(key)
+        if isinstance(result, str):
+            raise OSError(None, result)
+        return self._copy_results(result)
+
+    def _copy_results(self, results: list[ResolveResult]) -> list[ResolveResult]:
+        """Return a caller's own copy of the final results, shuffled if enabled.
+
+        Shuffling the final list, whether it came from the cache or not, keeps
+        the order consistent between both, including for merged dual results.
+        """
+        results = list(results)
+        if self._rng is not None and len(results) > 1:
+            _shuffle_results(self._rng, results)
+        return results
+
+    def _cache_store(
+        self, key: _QueryKey, result: list[ResolveResult] | OSError
+    ) -> None:
+        """Cache a result or error, evicting the least recently used entry."""
+        if isinstance(result, OSError):
+            if not (ttl := self._negative_ttl):
+                return
+            entry: list[ResolveResult] | str = result.strerror or str(result)
+        else:
+            if not (ttl := self._positive_ttl):
+                return
+            entry = result
+        self._res_cache[key] = (monotonic() + ttl, entry)
+        self._res_cache.move_to_end(key)
+        if len(self._res_cache) > _RESULT_CACHE_SIZE:
+            self._res_cache.popitem(last=False)
+
+    def _inflight_done(
+        self, key: _QueryKey, task: asyncio.Task[list[ResolveResult]]
+    ) -> None:
+        """Forget a finished in-flight query and cache its outcome."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also marks it retrieved in case every
+        # waiter was cancelled.
+        if (exc := task.exception()) is None:
+            self._cache_store(key, task.result())
+        elif isinstance(exc, OSError):
+            self._cache_store(key, exc)
 
     async def close(self) -> None:
         """Close the resolver.
 
         Safe to call more than once; subsequent calls are no-ops.
         """
-        if self._aiozc_owner and self._aiozc is not None:
-            await self._aiozc.async_close()
+        # Mark the resolver closed before awaiting anything so a lookup
+        # starting meanwhile cannot start a query that is never cancelled.
+        self._closed = True
+        if self._inflight:
+            inflight = list(self._inflight.values())
+            for task in inflight:
+                task.cancel()
+            await asyncio.gather(*inflight, return_exceptions=True)
+        self._res_cache.clear()
+        if self._aiozc is not None:
+            if self._aiozc_shared:
+                self._aiozc_shared = False  # release the reference only once
+                await _release_shared_aiozc(self._aiozc)
+            elif self._aiozc_owner:
+                await self._aiozc.async_close()
         await super().close()
-        self._aiozc = None  # type: ignore[assignment] # break ref cycles early
+        self._aiozc = None  # break ref cycles early
 
     async def __aenter__(self: _ResolverT) -> _ResolverT:
         """Return the resolver for use as an async context manager."""
@@ -139,16 +498,50 @@ class _AsyncMDNSResolverBase(AsyncResolver):
 class AsyncMDNSResolver(_AsyncMDNSResolverBase):
     """Use the `aiodns`/`zeroconf` packages to make asynchronous DNS lookups."""
 
+    __slots__ = ()
+
     async def resolve(
         self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
     ) -> list[ResolveResult]:
         """Resolve a host name to an IP address."""
         if not _is_local_name(host):
             return await super().resolve(host, port, family)
-        info = self._make_resolver(host, family)
-        if info.load_from_cache(self._aiozc.zeroconf):
-            return self._addresses_from_info_or_raise(info, port, family)
-        return await self._resolve_mdns(info, port, family)
+        host = _normalize_local_name(host)
+        key = (host, port, family)
+        if (cached := self._cache_lookup(key)) is not None:
+            return cached
+        if (task := self._inflight.get(key)) is None:
+            info, ip_version = self._make_resolver(host, family)
+            # Without a timeout there is nothing to await, so skip creating
+            # the _resolve_mdns() coroutine on a cache miss as well.
+            if (
+                info.load_from_cache(self._get_aiozc().zeroconf)
+                or not self._mdns_timeout_ms
+            ):
+                try:
+                    results = self._addresses_from_info_or_raise(info, port, ip_version)
+                except OSError as exc:
+                    self._cache_store(key, exc)
+                    raise
+                self._cache_store(key, results)
+                return self._copy_results(results)
+            task = _create_eager_task(
+                _get_running_loop(),
+                self._resolve_mdns(info, port, ip_version),
+            )
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._inflight_done, key))
+        # Shield the shared query so one caller being cancelled does not
+        # cancel it for everyone else, and hand each caller its own list.
+        try:
+            results = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Only close() cancels the shared query; callers that were not
+            # cancelled themselves see a failed lookup instead.
+            if not task.cancelled() or _current_task_cancelling():
+                raise
+            raise OSError(None, "MDNS lookup cancelled") from None
+        return self._copy_results(results)
 
 
 class AsyncDualMDNSResolver(_AsyncMDNSResolverBase):
@@ -161,59 +554,86 @@ class AsyncDualMDNSResolver(_AsyncMDNSResolverBase):
     - If both resolvers fail, an exception is raised.
     - If both resolvers return results at the same time, the results are
     combined and duplicates are removed.
+    - If ``stagger_delay`` is set, mDNS gets a head start of that many seconds
+    and regular DNS is only queried if mDNS has not answered by then.
     """
 
+    __slots__ = ("_stagger_delay",)
+
+    def __init__(
+        self, *args: Any, stagger_delay: float | None = None, **kwargs: Any
+    ) -> None:
+        """Initialize the resolver."""
+        super().__init__(*args, **kwargs)
+        self._stagger_delay = stagger_delay
+
     async def resolve(
         self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
     ) -> list[ResolveResult]:
         """Resolve a host name to an IP address."""
         if not _is_local_name(host):
             return await super().resolve(host, port, family)
-        info = self._make_resolver(host, family)
-        if info.load_from_cache(self._aiozc.zeroconf):
-            return self._addresses_from_info_or_raise(info, port, family)
-        resolve_via_mdns = self._resolve_mdns(info, port, family)
-        resolve_via_dns = super().resolve(host, port, family)
-        loop = asyncio.get_running_loop()
-        if sys.version_info >= (3, 12):
-            mdns_task = asyncio.Task(resolve_via_mdns, loop=loop, eager_start=True)
-            dns_task = asyncio.Task(resolve_via_dns, loop=loop, eager_start=True)
-        else:
-            mdns_task = loop.create_task(resolve_via_mdns)
-            dns_task = loop.create_task(resolve_via_dns)
-        tasks = (mdns_task, dns_task)
+        host = _normalize_local_name(host)
+        key = (host, port, family)
+        if (cached := self._cache_lookup(key)) is not None:
+            return cached
+        try:
+            results = await self._resolve_local(host, port, family)
+        except OSError as exc:
+            self._cache_store(key, exc)
+            raise
+        self._cache_store(key, results)
+        return self._copy_results(results)
+
+    async def _resolve_local(
+        self, host: str, port: int, family: socket.AddressFamily
+    ) -> list[ResolveResult]:
+        """Resolve a .local host name with both mDNS and regular DNS."""
+        info, ip_version = self._make_resolver(host, family)
+        if info.load_from_cache(self._get_aiozc().zeroconf):
+            return self._addresses_from_info_or_raise(info, port, ip_version)
+        loop = _get_running_loop()
+        mdns_task = _create_eager_task(loop, self._resolve_mdns(info, port, ip_version))
+        tasks: tuple[asyncio.Task[list[ResolveResult]], ...] = (mdns_task,)
         try:
-            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            if self._stagger_delay and not mdns_task.done():
+                # Give mDNS a head start so a fast answer does not cost a
+                # redundant unicast DNS query.
+                head_start = loop.create_future()
+                mdns_task.add_done_callback(partial(_set_first_done, head_start))
+                timer = loop.call_later(
+                    self._stagger_delay, _set_first_done, head_start
+                )
+                try:
+                    await head_start
+                finally:
+                    timer.cancel()
+            if self._stagger_delay and mdns_task.done() and not mdns_task.exception():
+                return mdns_task.result()
+            dns_task = _create_eager_task(loop, super().resolve(host, port, family))
+            tasks = (mdns_task, dns_task)
+            # A single future resolved by whichever task finishes first is much
+            # cheaper than asyncio.wait(..., return_when=FIRST_COMPLETED).
+            first = loop.create_future()
+            first_done = partial(_set_first_done, first)
+            mdns_task.add_done_callback(first_done)
+            dns_task.add_done_callback(first_done)
+            await first
+            # If the first task failed, wait for the other one. Its error is
+            # collected from the task below; only Exception is suppressed so
+            # cancelling resolve() still propagates.
             if mdns_task.done() and mdns_task.exception():
-                await asyncio.wait((dns_task,), return_when=asyncio.ALL_COMPLETED)
+                with suppress(Exception):
+                    await dns_task
             elif dns_task.done() and dns_task.exception():
-                await asyncio.wait((mdns_task,), return_when=asyncio.ALL_COMPLETED)
+                with suppress(Exception):
+                    await mdns_task
             resolve_results: list[ResolveResult] = []
             exceptions: list[BaseException] = []
-            seen_results: set[tuple[int, str]] = set()
-            for task in tasks:
-                if not task.done():
-                    continue
-                if exc := task.exception():
-                    exceptions.append(exc)
-                    continue
-                # If we have multiple results, we need to remove duplicates
-                # and combine the results. We put the mDNS results first
-                # to prioritize them. De-duplication keys on (port, host)
-                # only: the two resolvers report different hostname strings
-                # for the same name (mDNS uses zeroconf's trailing-dot
-                # ``info.server`` while DNS echoes the caller's input), so
-                # including hostname would let the same endpoint through
-                # twice. Within one resolve() call an (IP, port) pair
-                # uniquely identifies an endpoint.
-                for result in task.result():
-                    result_key = (
-                        result["port"],
-                        result["host"],
-                    )
-                    if result_key not in seen_results:
-                        seen_results.add(result_key)
-                        resolve_results.append(result)
+            seen_results: set[str] = set()
+            # mDNS results go first to prioritize them.
+            _collect_results(mdns_task, resolve_results, seen_results, exceptions)
+            _collect_results(dns_task, resolve_results, seen_results, exceptions)
 
             if resolve_results:
                 return resolve_results
@@ -224,13 +644,13 @@ class AsyncDualMDNSResolver(_AsyncMDNSResolverBase):
             )
             raise OSError(None, exception_strings)
         finally:
-            # asyncio.wait() does not cancel its child tasks when the awaiting
-            # coroutine is itself cancelled, so any still-pending task must be
-            # cancelled here to avoid orphaning work against the shared
-            # zeroconf instance. Also retrieve exceptions from already-done
-            # tasks so a fast-failing child cannot trigger a "Task exception
-            # was never retrieved" warning when the outer coroutine is
-            # cancelled before the result-collection loop runs.
+            # Cancelling the awaiting coroutine does not cancel the child
+            # tasks, so any still-pending task must be cancelled here to
+            # avoid orphaning work against the shared zeroconf instance. Also
+            # retrieve exceptions from already-done tasks so a fast-failing
+            # child cannot trigger a "Task exception was never retrieved"
+            # warning when the outer coroutine is cancelled before the
+            # result-collection loop runs.
             pending = [task for task in tasks if not task.done()]
             for task in tasks:
                 if task.done() and not task.cancelled():
@@ -241,9 +661,5 @@ class AsyncDualMDNSResolver(_AsyncMDNSResolverBase):
                 # return_exceptions=True ensures a child error cannot escape
                 # the finally and override the outcome of resolve().
                 await asyncio.gather(*pending, return_exceptions=True)
-                if (
-                    sys.version_info >= (3, 11)
-                    and (current_task := asyncio.current_task())
-                    and current_task.cancelling()
-                ):
+                if _current_task_cancelling():
                     raise asyncio.CancelledError
@@ -1,5 +1,6 @@
 import asyncio
 import socket
+import sys
 from collections.abc import AsyncGenerator, Callable, Generator
 from ipaddress import IPv4Address, IPv6Address
 from typing import Any, NoReturn
@@ -10,11 +11,13 @@ import pytest_asyncio
 from aiohttp.resolver import ResolveResult
 from zeroconf.asyncio import AsyncZeroconf
 
+from aiohttp_asyncmdnsresolver import _impl
 from aiohttp_asyncmdnsresolver._impl import (
-    _FAMILY_TO_RESOLVER_CLASS,
+    _FAMILY_TABLE,
     AddressResolver,
     AddressResolverIPv4,
     AddressResolverIPv6,
+    IPVersion,
 )
 from aiohttp_asyncmdnsresolver.api import AsyncDualMDNSResolver, AsyncMDNSResolver
 
@@ -31,15 +34,32 @@ class IPv6HostResolver(AddressResolverIPv6):
     """Patchable class for testing."""
 
 
+def _addresses_by_version(
+    addresses: list[IPv4Address | IPv6Address],
+) -> Callable[[IPVersion], list[IPv4Address | IPv6Address]]:
+    """Return an ``ip_addresses_by_version`` stand-in filtering ``addresses``."""
+
+    def _ip_addresses_by_version(
+        version: IPVersion,
+    ) -> list[IPv4Address | IPv6Address]:
+        if version is IPVersion.V4Only:
+            return [address for address in addresses if address.version == 4]
+        if version is IPVersion.V6Only:
+            return [address for address in addresses if address.version == 6]
+        return addresses
+
+    return _ip_addresses_by_version
+
+
 @pytest.fixture(autouse=True)
 def make_resolvers_patchable() -> Generator[None, None, None]:
     """Patch the resolvers."""
     with patch.dict(
-        _FAMILY_TO_RESOLVER_CLASS,
+        _FAMILY_TABLE,
         {
-            socket.AF_INET: IPv4HostResolver,
-            socket.AF_INET6: IPv6HostResolver,
-            socket.AF_UNSPEC: IPv6orIPv4HostResolver,
+            socket.AF_INET: (IPv4HostResolver, IPVersion.V4Only),
+            socket.AF_INET6: (IPv6HostResolver, IPVersion.V6Only),
+            socket.AF_UNSPEC: (IPv6orIPv4HostResolver, IPVersion.All),
         },
     ):
         yield
@@ -156,7 +176,9 @@ async def test_resolve_mdns_name_unspec(resolver: AsyncMDNSResolver) -> None:
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         result = await resolver.resolve("localhost.local", family=socket.AF_UNSPEC)
@@ -177,7 +199,9 @@ async def test_resolve_mdns_name_unspec_from_cache(resolver: AsyncMDNSResolver)
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         result = await resolver.resolve("localhost.local", 80, family=socket.AF_UNSPEC)
@@ -200,7 +224,7 @@ async def test_resolve_mdns_name_unspec_no_results(resolver: AsyncMDNSResolver)
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[],
+            side_effect=_addresses_by_version([]),
         ),
         pytest.raises(OSError, match="MDNS lookup failed"),
     ):
@@ -217,7 +241,9 @@ async def test_resolve_mdns_name_unspec_trailing_dot(
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         result = await resolver.resolve("localhost.local.", family=socket.AF_UNSPEC)
@@ -238,7 +264,9 @@ async def test_resolve_mdns_name_mixed_case(resolver: AsyncMDNSResolver) -> None
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         result = await resolver.resolve("Localhost.LOCAL", family=socket.AF_UNSPEC)
@@ -278,6 +306,122 @@ async def test_resolve_mdns_name_mixed_case_trailing_dot_async_dual_mdns_resolve
     assert results[0]["host"] == "127.0.0.1"
 
 
+@pytest.mark.asyncio
+async def test_resolve_mdns_name_shuffle(
+    mdns_resolver: Callable[..., AsyncMDNSResolver],
+) -> None:
+    """Test ``shuffle=True`` varies the order within each address family."""
+    resolver = mdns_resolver(shuffle=True)
+    ipv4 = [IPv4Address(f"127.0.0.{i}") for i in range(1, 9)]
+    ipv6 = [IPv6Address(f"::{i}") for i in range(1, 9)]
+    orders = set()
+    with (
+        patch.object(IPv6orIPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv6orIPv4HostResolver,
+            "ip_addresses_by_version",
+            side_effect=_addresses_by_version(ipv4 + ipv6),
+        ),
+    ):
+        for _ in range(10):
+            results = await resolver.resolve("localhost.local", family=socket.AF_UNSPEC)
+            hosts = tuple(result["host"] for result in results)
+            # IPv4 results are still grouped ahead of IPv6 results.
+            assert sorted(hosts[:8]) == sorted(str(ip) for ip in ipv4)
+            assert sorted(hosts[8:]) == sorted(str(ip) for ip in ipv6)
+            orders.add(hosts)
+
+    # Repeated lookups (served from the result cache) are shuffled as well.
+    assert len(orders) > 1
+
+
+@pytest.mark.asyncio
+async def test_dual_mdns_resolver_shuffle_unspec(
+    dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
+) -> None:
+    """Test the merged dual results are shuffled alike with and without cache."""
+    resolver = dual_mdns_resolver(shuffle=True)
+    dns_results = [
+        ResolveResult(  # type: ignore[typeddict-item]
+            hostname="localhost.local.",
+            host="10.0.0.1",
+            port=0,
+            family=socket.AF_INET,
+        ),
+        ResolveResult(  # type: ignore[typeddict-item]
+            hostname="localhost.local.",
+            host="::2",
+            port=0,
+            family=socket.AF_INET6,
+        ),
+    ]
+    ipv4_hosts = {"127.0.0.1", "127.0.0.2", "10.0.0.1"}
+    ipv6_hosts = {"::1", "::2"}
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+            return_value=dns_results,
+        ),
+        patch.object(IPv6orIPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv6orIPv4HostResolver,
+            "ip_addresses_by_version",
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv4Address("127.0.0.2"), IPv6Address("::1")]
+            ),
+        ),
+    ):
+        # The first lookup merges both resolvers; the rest hit the cache.
+        for _ in range(5):
+            results = await resolver.resolve("localhost.local", family=socket.AF_UNSPEC)
+            hosts = [result["host"] for result in results]
+            # Every IPv4 result, including the DNS ones, precedes IPv6.
+            assert set(hosts[:3]) == ipv4_hosts
+            assert set(hosts[3:]) == ipv6_hosts
+
+
+@pytest.mark.asyncio
+async def test_resolve_mdns_name_no_shuffle_by_default(
+    resolver: AsyncMDNSResolver,
+) -> None:
+    """Test results keep the zeroconf order unless shuffling is enabled."""
+    addresses = [IPv4Address(f"127.0.0.{i}") for i in range(1, 9)]
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=addresses,
+        ),
+    ):
+        results = await resolver.resolve("localhost.local")
+    assert [result["host"] for result in results] == [str(ip) for ip in addresses]
+
+
+@pytest.mark.asyncio
+async def test_dual_mdns_resolver_queries_normalized_name(
+    dual_resolver: AsyncDualMDNSResolver,
+) -> None:
+    """Test both resolvers are queried with the lowercase, dotted name."""
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+            return_value=[
+                ResolveResult(hostname="myhost.local.", host="127.0.0.1", port=0)  # type: ignore[typeddict-item]
+            ],
+        ) as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        results = await dual_resolver.resolve("MyHost.Local")
+    mock_dns.assert_awaited_once_with("myhost.local.", 0, socket.AF_INET)
+    assert results[0]["hostname"] == "myhost.local."
+
+
 @pytest.mark.asyncio
 async def test_resolve_mdns_name_af_inet(resolver: AsyncMDNSResolver) -> None:
     """Test the resolve method with socket.AF_INET family."""
@@ -374,7 +518,9 @@ async def test_resolve_mdns_passed_in_asynczeroconf(
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         result = await custom_resolver.resolve(
@@ -389,6 +535,111 @@ async def test_resolve_mdns_passed_in_asynczeroconf(
     assert result[1]["host"] == "::1"
 
 
+@pytest.mark.asyncio
+async def test_concurrent_resolves_share_one_query(
+    resolver: AsyncMDNSResolver,
+) -> None:
+    """Concurrent lookups of the same name issue a single mDNS query."""
+    calls = 0
+
+    async def _slow_request(*args: Any, **kwargs: Any) -> bool:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return True
+
+    with (
+        patch.object(IPv4HostResolver, "async_request", _slow_request),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        first, second = await asyncio.gather(
+            resolver.resolve("localhost.local"), resolver.resolve("localhost.local")
+        )
+
+    assert calls == 1
+    assert first == second
+    assert first[0]["host"] == "127.0.0.1"
+    # Each caller gets its own list so one cannot mutate the other's result.
+    assert first is not second
+    assert not resolver._inflight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_resolve_failure_shared(
+    resolver: AsyncMDNSResolver,
+) -> None:
+    """A failed shared query raises for every waiting caller."""
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[],
+        ),
+    ):
+        results = await asyncio.gather(
+            resolver.resolve("localhost.local"),
+            resolver.resolve("localhost.local"),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, OSError) for result in results)
+    assert not resolver._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_query(
+    resolver: AsyncMDNSResolver,
+) -> None:
+    """Cancelling one caller leaves the shared query running for the others."""
+
+    async def _slow_request(*args: Any, **kwargs: Any) -> bool:
+        await asyncio.sleep(0.05)
+        return True
+
+    with (
+        patch.object(IPv4HostResolver, "async_request", _slow_request),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        first = asyncio.create_task(resolver.resolve("localhost.local"))
+        second = asyncio.create_task(resolver.resolve("localhost.local"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        results = await second
+
+    assert results[0]["host"] == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_inflight_queries() -> None:
+    """Closing the resolver cancels mDNS queries still on the network."""
+    resolver = AsyncMDNSResolver(mdns_timeout=0.1)
+
+    async def _slow_request(*args: Any, **kwargs: Any) -> bool:
+        await asyncio.sleep(1.0)
+        return True
+
+    with patch.object(IPv4HostResolver, "async_request", _slow_request):
+        resolve_task = asyncio.create_task(resolver.resolve("localhost.local"))
+        await asyncio.sleep(0)
+        assert resolver._inflight
+        await resolver.close()
+        # The waiting caller was not cancelled itself, so it sees an OSError.
+        with pytest.raises(OSError, match="MDNS lookup cancelled"):
+            await resolve_task
+    assert not resolver._inflight
+
+
 @pytest.mark.asyncio
 async def test_create_destroy_resolver() -> None:
     """Test the resolver can be created and destroyed."""
@@ -409,12 +660,95 @@ async def test_create_destroy_resolver_no_aiozc() -> None:
     assert resolver._aiozc_owner is True
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resolver_cls", [AsyncMDNSResolver, AsyncDualMDNSResolver])
+async def test_resolver_state_in_slots(
+    resolver_cls: type[AsyncMDNSResolver] | type[AsyncDualMDNSResolver],
+) -> None:
+    """Test the resolver keeps its own state in slots, not the instance dict."""
+    resolver = resolver_cls(mdns_timeout=0.1)
+    try:
+        assert not set(resolver.__dict__) & set(_impl._AsyncMDNSResolverBase.__slots__)
+        assert "_stagger_delay" not in resolver.__dict__
+    finally:
+        await resolver.close()
+
+
+@pytest.mark.asyncio
+async def test_zeroconf_created_on_first_local_resolve(
+    resolver: AsyncMDNSResolver,
+) -> None:
+    """Test no AsyncZeroconf is started until a .local name is resolved."""
+    assert resolver._aiozc is None
+    with patch(
+        "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+        return_value=[ResolveResult(hostname="localhost", host="127.0.0.1")],  # type: ignore[typeddict-item]
+    ):
+        await resolver.resolve("localhost")
+    assert resolver._aiozc is None
+
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        await resolver.resolve("localhost.local")
+    assert resolver._aiozc is not None
+
+
+@pytest.mark.asyncio
+async def test_shared_zeroconf_not_acquired_until_used() -> None:
+    """Test a shared resolver that never resolves .local holds no reference."""
+    async with AsyncMDNSResolver(mdns_timeout=0.1, shared=True) as resolver:
+        assert resolver._aiozc is None
+        assert not _impl._SHARED_AIOZC
+    assert not _impl._SHARED_AIOZC
+
+
+@pytest.mark.asyncio
+async def test_resolve_after_close_does_not_recreate_zeroconf() -> None:
+    """Test a closed resolver refuses to start a new AsyncZeroconf."""
+    resolver = AsyncMDNSResolver(mdns_timeout=0.1)
+    await resolver.close()
+    with pytest.raises(RuntimeError, match="Resolver is closed"):
+        await resolver.resolve("localhost.local")
+    assert resolver._aiozc is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_during_close_starts_no_query() -> None:
+    """Test a lookup starting while close() is waiting is refused."""
+    resolver = AsyncMDNSResolver(mdns_timeout=0.1)
+
+    async def _slow_request(*args: Any, **kwargs: Any) -> bool:
+        await asyncio.sleep(1.0)
+        return True
+
+    with patch.object(IPv4HostResolver, "async_request", _slow_request):
+        resolve_task = asyncio.create_task(resolver.resolve("first.local"))
+        await asyncio.sleep(0)
+        close_task = asyncio.create_task(resolver.close())
+        await asyncio.sleep(0)
+        # close() is still waiting for the cancelled in-flight query.
+        assert not close_task.done()
+        with pytest.raises(RuntimeError, match="Resolver is closed"):
+            await resolver.resolve("second.local")
+        assert list(resolver._inflight) == [("first.local.", 0, socket.AF_INET)]
+        await close_task
+        with pytest.raises(OSError, match="MDNS lookup cancelled"):
+            await resolve_task
+    assert not resolver._inflight
+
+
 @pytest.mark.asyncio
 async def test_async_context_manager_closes_resolver() -> None:
     """Test ``async with`` closes an owned resolver on exit."""
     async with AsyncMDNSResolver(mdns_timeout=0.1) as resolver:
         assert isinstance(resolver, AsyncMDNSResolver)
-        assert resolver._aiozc is not None
+        assert resolver._get_aiozc() is not None
         assert resolver._aiozc_owner is True
     assert resolver._aiozc is None
 
@@ -424,7 +758,7 @@ async def test_async_context_manager_closes_dual_resolver() -> None:
     """Test ``async with`` closes an owned dual resolver on exit."""
     async with AsyncDualMDNSResolver(mdns_timeout=0.1) as resolver:
         assert isinstance(resolver, AsyncDualMDNSResolver)
-        assert resolver._aiozc is not None
+        assert resolver._get_aiozc() is not None
     assert resolver._aiozc is None
 
 
@@ -708,7 +1042,9 @@ async def test_unspec_combines_ipv4_and_ipv6_async_dual_mdns_resolver(
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         results = await dual_resolver.resolve(
@@ -752,6 +1088,112 @@ async def test_inet6_distinct_results_async_dual_mdns_resolver(
     assert results[1]["host"] == "::2"
 
 
+@pytest.mark.asyncio
+async def test_stagger_delay_skips_dns_when_mdns_answers_dual_mdns_resolver(
+    dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
+) -> None:
+    """Test a fast mDNS answer within ``stagger_delay`` never queries DNS."""
+    dual_resolver = dual_mdns_resolver(stagger_delay=0.5)
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+        ) as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.2")],
+        ),
+    ):
+        results = await dual_resolver.resolve("localhost.local.")
+    mock_dns.assert_not_called()
+    assert len(results) == 1
+    assert results[0]["host"] == "127.0.0.2"
+
+
+@pytest.mark.asyncio
+async def test_stagger_delay_falls_back_to_dns_when_mdns_slow_dual_mdns_resolver(
+    dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
+) -> None:
+    """Test DNS is queried once mDNS has not answered within ``stagger_delay``."""
+    dual_resolver = dual_mdns_resolver(stagger_delay=0.01)
+
+    async def _take_a_while_to_resolve(*args: Any, **kwargs: Any) -> NoReturn:
+        await asyncio.sleep(0.5)
+        raise RuntimeError("Should not be called")
+
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+            return_value=[
+                ResolveResult(hostname="localhost.local.", host="127.0.0.1", port=0)  # type: ignore[typeddict-item]
+            ],
+        ) as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", _take_a_while_to_resolve),
+    ):
+        results = await dual_resolver.resolve("localhost.local.")
+    mock_dns.assert_awaited_once()
+    assert len(results) == 1
+    assert results[0]["host"] == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_stagger_delay_falls_back_to_dns_when_mdns_fails_dual_mdns_resolver(
+    dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
+) -> None:
+    """Test DNS is queried right away when mDNS fails within ``stagger_delay``."""
+    dual_resolver = dual_mdns_resolver(stagger_delay=0.5)
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+            return_value=[
+                ResolveResult(hostname="localhost.local.", host="127.0.0.1", port=0)  # type: ignore[typeddict-item]
+            ],
+        ) as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[],
+        ),
+    ):
+        results = await dual_resolver.resolve("localhost.local.")
+    mock_dns.assert_awaited_once()
+    assert len(results) == 1
+    assert results[0]["host"] == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_stagger_delay_dual_mdns_resolver(
+    dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
+) -> None:
+    """Test cancelling during the mDNS head start cancels the mDNS task."""
+    dual_resolver = dual_mdns_resolver(stagger_delay=1.0)
+    mdns_cancelled = False
+
+    async def _mdns_slow(*args: Any, **kwargs: Any) -> NoReturn:
+        nonlocal mdns_cancelled
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            mdns_cancelled = True
+            raise
+        raise RuntimeError("Should not finish")
+
+    with (
+        patch("aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve") as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", _mdns_slow),
+    ):
+        resolve_task = asyncio.create_task(dual_resolver.resolve("localhost.local."))
+        await asyncio.sleep(0.05)
+        resolve_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await resolve_task
+
+    assert mdns_cancelled is True
+    mock_dns.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_different_results_async_dual_mdns_resolver_zero_timeout(
     dual_mdns_resolver: Callable[..., AsyncDualMDNSResolver],
@@ -892,6 +1334,204 @@ async def test_close_idempotent_custom_zeroconf() -> None:
     await aiozc.async_close()
 
 
+@pytest.mark.asyncio
+async def test_shared_zeroconf_reused_and_refcounted() -> None:
+    """Resolvers created with ``shared=True`` share one AsyncZeroconf."""
+    first = AsyncMDNSResolver(mdns_timeout=0.1, shared=True)
+    second = AsyncDualMDNSResolver(mdns_timeout=0.1, shared=True)
+    aiozc = first._get_aiozc()
+    assert second._get_aiozc() is aiozc
+    assert first._aiozc_owner is False
+    loop = asyncio.get_running_loop()
+    assert _impl._SHARED_AIOZC == {loop: (aiozc, 2)}
+
+    await first.close()
+    # Closing twice must not drop a second reference.
+    await first.close()
+    assert _impl._SHARED_AIOZC == {loop: (aiozc, 1)}
+
+    with patch.object(aiozc, "async_close", wraps=aiozc.async_close) as close:
+        await second.close()
+    close.assert_awaited_once()
+    assert not _impl._SHARED_AIOZC
+
+
+@pytest.mark.asyncio
+async def test_shared_zeroconf_recreated_after_last_close() -> None:
+    """A new shared resolver after the last one closed gets a fresh instance."""
+    async with AsyncMDNSResolver(mdns_timeout=0.1, shared=True) as resolver:
+        old_aiozc = resolver._get_aiozc()
+    async with AsyncMDNSResolver(mdns_timeout=0.1, shared=True) as resolver:
+        assert resolver._get_aiozc() is not old_aiozc
+    assert not _impl._SHARED_AIOZC
+
+
+@pytest.mark.asyncio
+async def test_shared_ignored_with_passed_in_zeroconf() -> None:
+    """An explicit ``async_zeroconf`` takes precedence over ``shared=True``."""
+    aiozc = AsyncZeroconf()
+    resolver = AsyncMDNSResolver(mdns_timeout=0.1, async_zeroconf=aiozc, shared=True)
+    assert resolver._aiozc is aiozc
+    assert not _impl._SHARED_AIOZC
+    await resolver.close()
+    await aiozc.async_close()
+
+
+def test_shared_zeroconf_per_event_loop() -> None:
+    """Resolvers on different event loops never share an AsyncZeroconf."""
+
+    async def _make_resolver() -> tuple[AsyncMDNSResolver, AsyncZeroconf]:
+        resolver = AsyncMDNSResolver(mdns_timeout=0.1, shared=True)
+        return resolver, resolver._get_aiozc()
+
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first, first_aiozc = first_loop.run_until_complete(_make_resolver())
+        second, second_aiozc = second_loop.run_until_complete(_make_resolver())
+        assert first_aiozc is not second_aiozc
+        assert first_aiozc.zeroconf.loop is first_loop
+        assert second_aiozc.zeroconf.loop is second_loop
+        assert _impl._SHARED_AIOZC == {
+            first_loop: (first_aiozc, 1),
+            second_loop: (second_aiozc, 1),
+        }
+        first_loop.run_until_complete(first.close())
+        assert _impl._SHARED_AIOZC == {second_loop: (second_aiozc, 1)}
+        second_loop.run_until_complete(second.close())
+        assert not _impl._SHARED_AIOZC
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+def test_shared_zeroconf_dropped_with_closed_loop() -> None:
+    """An instance left on a closed loop is not handed out on a new loop."""
+
+    async def _make_resolver() -> tuple[AsyncMDNSResolver, AsyncZeroconf]:
+        resolver = AsyncMDNSResolver(mdns_timeout=0.1, shared=True)
+        return resolver, resolver._get_aiozc()
+
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        # The first resolver is never closed before its loop goes away.
+        first, first_aiozc = first_loop.run_until_complete(_make_resolver())
+        first_loop.run_until_complete(first_aiozc.async_close())
+        first_loop.close()
+
+        second, second_aiozc = second_loop.run_until_complete(_make_resolver())
+        assert second_aiozc is not first_aiozc
+        assert _impl._SHARED_AIOZC == {second_loop: (second_aiozc, 1)}
+        second_loop.run_until_complete(second.close())
+        assert not _impl._SHARED_AIOZC
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+def test_shared_zeroconf_pruned_on_release() -> None:
+    """Releasing a shared instance forgets instances left on closed loops."""
+
+    async def _make_resolver() -> tuple[AsyncMDNSResolver, AsyncZeroconf]:
+        resolver = AsyncMDNSResolver(mdns_timeout=0.1, shared=True)
+        return resolver, resolver._get_aiozc()
+
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first, first_aiozc = first_loop.run_until_complete(_make_resolver())
+        # The second resolver is never closed before its loop goes away.
+        second, second_aiozc = second_loop.run_until_complete(_make_resolver())
+        second_loop.run_until_complete(second_aiozc.async_close())
+        second_loop.close()
+        assert second_loop in _impl._SHARED_AIOZC
+
+        first_loop.run_until_complete(first.close())
+        assert not _impl._SHARED_AIOZC
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+def test_loop_accepts_eager_start() -> None:
+    """Detect whether a loop's ``create_task()`` can forward ``eager_start``."""
+
+    class _KwargsLoop:
+        def create_task(self, coro: Any, **kwargs: Any) -> None:
+            """Accept arbitrary task factory keyword arguments."""
+
+    class _EagerLoop:
+        def create_task(self, coro: Any, *, eager_start: bool = False) -> None:
+            """Accept ``eager_start`` explicitly."""
+
+    class _PlainLoop:
+        def create_task(self, coro: Any, *, name: str | None = None) -> None:
+            """Accept only the pre-3.13.3 arguments."""
+
+    class _OpaqueLoop:
+        create_task = None
+
+    assert _impl._loop_accepts_eager_start(_KwargsLoop()) is True  # type: ignore[arg-type]
+    assert _impl._loop_accepts_eager_start(_EagerLoop()) is True  # type: ignore[arg-type]
+    assert _impl._loop_accepts_eager_start(_PlainLoop()) is False  # type: ignore[arg-type]
+    assert _impl._loop_accepts_eager_start(_OpaqueLoop()) is False  # type: ignore[arg-type]
+
+
+def test_task_factory_accepts_eager_start() -> None:
+    """Detect whether a task factory can be passed ``eager_start``."""
+
+    def _legacy_factory(loop: Any, coro: Any, context: Any = None) -> None:
+        """Accept only the pre-3.13.3 arguments."""
+
+    def _kwargs_factory(loop: Any, coro: Any, **kwargs: Any) -> None:
+        """Accept arbitrary task keyword arguments."""
+
+    class _UnhashableFactory:
+        __hash__ = None  # type: ignore[assignment]
+
+        def __eq__(self, other: object) -> bool:
+            return self is other
+
+        def __call__(self, loop: Any, coro: Any, **kwargs: Any) -> None:
+            """Accept arbitrary task keyword arguments."""
+
+    assert _impl._accepts_eager_start(_legacy_factory) is False
+    assert _impl._accepts_eager_start(_kwargs_factory) is True
+    assert _impl._accepts_eager_start(_UnhashableFactory()) is True
+    # A callable whose signature cannot be inspected is not passed eager_start.
+    assert _impl._accepts_eager_start(getattr) is False
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="needs eager tasks")
+@pytest.mark.asyncio
+async def test_create_eager_task_with_legacy_task_factory() -> None:
+    """A task factory without ``eager_start`` is bypassed, not passed it."""
+    loop = asyncio.get_running_loop()
+    factory_calls = 0
+
+    def _legacy_factory(
+        loop: asyncio.AbstractEventLoop, coro: Any, context: Any = None
+    ) -> asyncio.Task[Any]:
+        nonlocal factory_calls
+        factory_calls += 1
+        return asyncio.Task(coro, loop=loop)
+
+    async def _answer() -> int:
+        return 42
+
+    loop.set_task_factory(_legacy_factory)
+    try:
+        # Behave as if the loop forwarded keyword arguments to the factory.
+        with patch.dict(_impl._LOOP_ACCEPTS_EAGER_START, {type(loop): True}):
+            task = _impl._create_eager_task(loop, _answer())
+    finally:
+        loop.set_task_factory(None)
+    assert task.done()
+    assert await task == 42
+    assert factory_calls == 0
+
+
 @pytest.mark.asyncio
 async def test_no_cancel_swallow_dual_mdns_resolver(
     dual_resolver: AsyncMDNSResolver,
@@ -26,6 +26,8 @@ NON_MDNS_HOSTS = [
     "foo.localdomain",  # contains ".local" only as a substring, not a suffix
     "local.example.com",  # starts with "local." but is not a .local name
     "host.local.example.com",  # ".local." appears mid-name, not as the suffix
+    "local",  # the bare label without a leading dot
+    "host.local..",  # only a single trailing dot is stripped before matching
 ]
 
 
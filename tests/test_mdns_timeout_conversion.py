@@ -20,9 +20,10 @@ import pytest
 import pytest_asyncio
 
 from aiohttp_asyncmdnsresolver._impl import (
-    _FAMILY_TO_RESOLVER_CLASS,
+    _FAMILY_TABLE,
     DEFAULT_TIMEOUT,
     AddressResolverIPv4,
+    IPVersion,
 )
 from aiohttp_asyncmdnsresolver.api import AsyncMDNSResolver
 
@@ -34,7 +35,9 @@ class IPv4HostResolver(AddressResolverIPv4):
 @pytest.fixture(autouse=True)
 def make_resolvers_patchable() -> Any:
     """Route AF_INET lookups through the patchable subclass."""
-    with patch.dict(_FAMILY_TO_RESOLVER_CLASS, {socket.AF_INET: IPv4HostResolver}):
+    with patch.dict(
+        _FAMILY_TABLE, {socket.AF_INET: (IPv4HostResolver, IPVersion.V4Only)}
+    ):
         yield
 
 
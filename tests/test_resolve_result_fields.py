@@ -1,21 +1,22 @@
 """Lock in the socket-level fields of mDNS ``ResolveResult`` entries.
 
 Each resolved address is converted to an aiohttp ``ResolveResult`` by
-``_to_resolve_result``. Beyond ``hostname``/``host``/``port`` (covered in
-``test_impl.py``), every result also carries ``family``, ``proto`` and ``flags``
-that aiohttp uses to open the right kind of socket without further name
-resolution. The most subtle of these is ``family``: it is derived from the
-*address version* of the resolved IP, not from the family requested in the
-query. An ``AF_UNSPEC`` lookup that returns a mix of IPv4 and IPv6 addresses
-must therefore tag each result individually. None of these fields were asserted
-anywhere, so a refactor of the conversion (e.g. echoing the query family) would
-misroute aiohttp's socket selection while every existing test still passed.
+``_to_resolve_result_v4`` or ``_to_resolve_result_v6``. Beyond
+``hostname``/``host``/``port`` (covered in ``test_impl.py``), every result also
+carries ``family``, ``proto`` and ``flags`` that aiohttp uses to open the right
+kind of socket without further name resolution. The most subtle of these is
+``family``: it is derived from the *address version* of the resolved IP, not
+from the family requested in the query. An ``AF_UNSPEC`` lookup that returns a
+mix of IPv4 and IPv6 addresses must therefore tag each result individually.
+None of these fields were asserted anywhere, so a refactor of the conversion
+(e.g. echoing the query family) would misroute aiohttp's socket selection while
+every existing test still passed.
 """
 
 from __future__ import annotations
 
 import socket
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Callable, Generator
 from ipaddress import IPv4Address, IPv6Address
 from unittest.mock import patch
 
@@ -23,11 +24,12 @@ import pytest
 import pytest_asyncio
 
 from aiohttp_asyncmdnsresolver._impl import (
-    _FAMILY_TO_RESOLVER_CLASS,
+    _FAMILY_TABLE,
     _NUMERIC_SOCKET_FLAGS,
     AddressResolver,
     AddressResolverIPv4,
     AddressResolverIPv6,
+    IPVersion,
 )
 from aiohttp_asyncmdnsresolver.api import AsyncMDNSResolver
 
@@ -44,15 +46,32 @@ class IPv6HostResolver(AddressResolverIPv6):
     """Patchable class for testing."""
 
 
+def _addresses_by_version(
+    addresses: list[IPv4Address | IPv6Address],
+) -> Callable[[IPVersion], list[IPv4Address | IPv6Address]]:
+    """Return an ``ip_addresses_by_version`` stand-in filtering ``addresses``."""
+
+    def _ip_addresses_by_version(
+        version: IPVersion,
+    ) -> list[IPv4Address | IPv6Address]:
+        if version is IPVersion.V4Only:
+            return [address for address in addresses if address.version == 4]
+        if version is IPVersion.V6Only:
+            return [address for address in addresses if address.version == 6]
+        return addresses
+
+    return _ip_addresses_by_version
+
+
 @pytest.fixture(autouse=True)
 def make_resolvers_patchable() -> Generator[None, None, None]:
     """Swap the family->resolver map for patchable subclasses."""
     with patch.dict(
-        _FAMILY_TO_RESOLVER_CLASS,
+        _FAMILY_TABLE,
         {
-            socket.AF_INET: IPv4HostResolver,
-            socket.AF_INET6: IPv6HostResolver,
-            socket.AF_UNSPEC: IPv6orIPv4HostResolver,
+            socket.AF_INET: (IPv4HostResolver, IPVersion.V4Only),
+            socket.AF_INET6: (IPv6HostResolver, IPVersion.V6Only),
+            socket.AF_UNSPEC: (IPv6orIPv4HostResolver, IPVersion.All),
         },
     ):
         yield
@@ -82,7 +101,9 @@ async def test_unspec_result_family_follows_address_version(
         patch.object(
             IPv6orIPv4HostResolver,
             "ip_addresses_by_version",
-            return_value=[IPv4Address("127.0.0.1"), IPv6Address("::1")],
+            side_effect=_addresses_by_version(
+                [IPv4Address("127.0.0.1"), IPv6Address("::1")]
+            ),
         ),
     ):
         results = await resolver.resolve("localhost.local", family=socket.AF_UNSPEC)
@@ -0,0 +1,318 @@
+"""Tests for the per-resolver cache of ``.local`` lookup results.
+
+Both resolvers remember the outcome of a ``.local`` lookup for a short while:
+successful results for ``positive_ttl`` seconds and failures for
+``negative_ttl`` seconds (``_POSITIVE_CACHE_TTL`` and ``_NEGATIVE_CACHE_TTL``
+by default), bounded to ``_RESULT_CACHE_SIZE`` entries with
+least-recently-used eviction. These tests pin that repeated lookups are
+answered without touching zeroconf again, that callers cannot corrupt the
+cached list, that entries expire and are evicted as documented, and that a
+falsy lifetime disables caching.
+"""
+
+from __future__ import annotations
+
+import socket
+from collections.abc import AsyncGenerator, Generator
+from ipaddress import IPv4Address
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from aiohttp.resolver import ResolveResult
+
+from aiohttp_asyncmdnsresolver import _impl
+from aiohttp_asyncmdnsresolver._impl import (
+    _FAMILY_TABLE,
+    AddressResolverIPv4,
+    IPVersion,
+)
+from aiohttp_asyncmdnsresolver.api import AsyncDualMDNSResolver, AsyncMDNSResolver
+
+
+class IPv4HostResolver(AddressResolverIPv4):
+    """Patchable class for testing."""
+
+
+@pytest.fixture(autouse=True)
+def make_resolvers_patchable() -> Generator[None, None, None]:
+    """Route AF_INET lookups through the patchable subclass."""
+    with patch.dict(
+        _FAMILY_TABLE, {socket.AF_INET: (IPv4HostResolver, IPVersion.V4Only)}
+    ):
+        yield
+
+
+@pytest_asyncio.fixture
+async def resolver() -> AsyncGenerator[AsyncMDNSResolver]:
+    """Return a resolver closed during teardown."""
+    resolver = AsyncMDNSResolver(mdns_timeout=0.1)
+    yield resolver
+    await resolver.close()
+
+
+@pytest_asyncio.fixture
+async def dual_resolver() -> AsyncGenerator[AsyncDualMDNSResolver]:
+    """Return a dual resolver closed during teardown."""
+    dual_resolver = AsyncDualMDNSResolver(mdns_timeout=0.1)
+    yield dual_resolver
+    await dual_resolver.close()
+
+
+@pytest.mark.asyncio
+async def test_positive_result_cached(resolver: AsyncMDNSResolver) -> None:
+    """A second lookup is served from the cache as an independent copy."""
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ) as ip_addresses,
+    ):
+        first = await resolver.resolve("localhost.local")
+        first.clear()
+        second = await resolver.resolve("localhost.local")
+
+    ip_addresses.assert_called_once()
+    assert len(second) == 1
+    assert second[0]["host"] == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_zeroconf_cache_hit_cached(resolver: AsyncMDNSResolver) -> None:
+    """A result read from the zeroconf cache is cached as well."""
+    with (
+        patch.object(
+            IPv4HostResolver, "load_from_cache", return_value=True
+        ) as load_from_cache,
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        await resolver.resolve("localhost.local")
+        results = await resolver.resolve("localhost.local")
+
+    load_from_cache.assert_called_once()
+    assert results[0]["host"] == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_negative_result_cached(resolver: AsyncMDNSResolver) -> None:
+    """A failed lookup is re-raised from the cache without a new query."""
+    with (
+        patch.object(
+            IPv4HostResolver, "async_request", return_value=True
+        ) as async_request,
+        patch.object(IPv4HostResolver, "ip_addresses_by_version", return_value=[]),
+    ):
+        for _ in range(2):
+            with pytest.raises(OSError, match="MDNS lookup failed"):
+                await resolver.resolve("localhost.local")
+
+    async_request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_negative_result_raised_fresh(resolver: AsyncMDNSResolver) -> None:
+    """Each cache hit raises a new exception without an earlier traceback."""
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(IPv4HostResolver, "ip_addresses_by_version", return_value=[]),
+    ):
+        errors = []
+        for _ in range(3):
+            with pytest.raises(OSError, match="MDNS lookup failed") as exc_info:
+                await resolver.resolve("localhost.local")
+            errors.append(exc_info.value)
+
+    assert errors[1] is not errors[2]
+    assert errors[1].errno is None
+    assert errors[1].strerror == "MDNS lookup failed"
+    # The cache holds only the message, not an exception object.
+    assert not any(
+        isinstance(result, BaseException) for _, result in resolver._res_cache.values()
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("positive_ttl", [0, None])
+async def test_positive_cache_disabled(positive_ttl: float | None) -> None:
+    """A falsy ``positive_ttl`` resolves every lookup again."""
+    async with AsyncMDNSResolver(
+        mdns_timeout=0.1, positive_ttl=positive_ttl
+    ) as resolver:
+        with (
+            patch.object(IPv4HostResolver, "async_request", return_value=True),
+            patch.object(
+                IPv4HostResolver,
+                "ip_addresses_by_version",
+                return_value=[IPv4Address("127.0.0.1")],
+            ) as ip_addresses,
+        ):
+            await resolver.resolve("localhost.local")
+            await resolver.resolve("localhost.local")
+
+        assert ip_addresses.call_count == 2
+        assert not resolver._res_cache
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("negative_ttl", [0, None])
+async def test_negative_cache_disabled(negative_ttl: float | None) -> None:
+    """A falsy ``negative_ttl`` queries again after a failed lookup."""
+    async with AsyncMDNSResolver(
+        mdns_timeout=0.1, negative_ttl=negative_ttl
+    ) as resolver:
+        with (
+            patch.object(
+                IPv4HostResolver, "async_request", return_value=True
+            ) as async_request,
+            patch.object(IPv4HostResolver, "ip_addresses_by_version", return_value=[]),
+        ):
+            for _ in range(2):
+                with pytest.raises(OSError, match="MDNS lookup failed"):
+                    await resolver.resolve("localhost.local")
+
+        assert async_request.call_count == 2
+        assert not resolver._res_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_per_resolver() -> None:
+    """Entries live for the ``positive_ttl`` given to the resolver."""
+    now = 1000.0
+
+    def _monotonic() -> float:
+        return now
+
+    async with AsyncMDNSResolver(mdns_timeout=0.1, positive_ttl=5.0) as resolver:
+        with (
+            patch.object(_impl, "monotonic", _monotonic),
+            patch.object(IPv4HostResolver, "async_request", return_value=True),
+            patch.object(
+                IPv4HostResolver,
+                "ip_addresses_by_version",
+                return_value=[IPv4Address("127.0.0.1")],
+            ) as ip_addresses,
+        ):
+            await resolver.resolve("localhost.local")
+            now += 4.0
+            await resolver.resolve("localhost.local")
+            assert ip_addresses.call_count == 1
+            now += 1.0
+            await resolver.resolve("localhost.local")
+            assert ip_addresses.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_expire(resolver: AsyncMDNSResolver) -> None:
+    """An expired entry is dropped and the name is resolved again."""
+    now = 1000.0
+
+    def _monotonic() -> float:
+        return now
+
+    with (
+        patch.object(_impl, "monotonic", _monotonic),
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ) as ip_addresses,
+    ):
+        await resolver.resolve("localhost.local")
+        now += _impl._POSITIVE_CACHE_TTL - 1
+        await resolver.resolve("localhost.local")
+        assert ip_addresses.call_count == 1
+        now += 1
+        await resolver.resolve("localhost.local")
+        assert ip_addresses.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(resolver: AsyncMDNSResolver) -> None:
+    """The least recently used entry is evicted once the cache is full."""
+    with (
+        patch.object(_impl, "_RESULT_CACHE_SIZE", 2),
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        await resolver.resolve("a.local")
+        await resolver.resolve("b.local")
+        # Touch "a.local" so "b.local" becomes the least recently used.
+        await resolver.resolve("a.local")
+        await resolver.resolve("c.local")
+
+    cached_hosts = [key[0] for key in resolver._res_cache]
+    assert cached_hosts == ["a.local.", "c.local."]
+
+
+@pytest.mark.asyncio
+async def test_cache_key_normalized(resolver: AsyncMDNSResolver) -> None:
+    """Spellings differing in case or trailing dot share one cache entry."""
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ) as ip_addresses,
+    ):
+        for host in ("MyHost.local", "myhost.local.", "MYHOST.LOCAL."):
+            results = await resolver.resolve(host)
+            assert results[0]["hostname"] == "myhost.local."
+
+    ip_addresses.assert_called_once()
+    assert list(resolver._res_cache) == [("myhost.local.", 0, socket.AF_INET)]
+
+
+@pytest.mark.asyncio
+async def test_dual_resolver_result_cached(
+    dual_resolver: AsyncDualMDNSResolver,
+) -> None:
+    """The dual resolver caches its combined result."""
+    with (
+        patch(
+            "aiohttp_asyncmdnsresolver._impl.AsyncResolver.resolve",
+            return_value=[
+                ResolveResult(hostname="localhost.local.", host="127.0.0.1", port=0)  # type: ignore[typeddict-item]
+            ],
+        ) as mock_dns,
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.2")],
+        ),
+    ):
+        first = await dual_resolver.resolve("localhost.local.")
+        second = await dual_resolver.resolve("localhost.local.")
+
+    mock_dns.assert_awaited_once()
+    assert first == second
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_close_clears_cache(resolver: AsyncMDNSResolver) -> None:
+    """Closing the resolver drops cached results."""
+    with (
+        patch.object(IPv4HostResolver, "async_request", return_value=True),
+        patch.object(
+            IPv4HostResolver,
+            "ip_addresses_by_version",
+            return_value=[IPv4Address("127.0.0.1")],
+        ),
+    ):
+        await resolver.resolve("localhost.local")
+    assert resolver._res_cache
+    await resolver.close()
+    assert not resolver._res_cache